@@ -0,0 +1,282 @@
+"""Headless local JSON API over the vacation tracker's data layer.
+
+Usage: python api.py [--host 127.0.0.1] [--port 8765] [--readers 8]
+
+    GET  /employees?name=&status=&include_archived=1   list/filter employees
+    GET  /employees/<id>                               one employee
+    GET  /employees/<id>/balance?as_of=YYYY/MM/DD      ledger balance as of a date (default today)
+    GET  /employees/<id>/usage?from=YYYY/MM/DD&to=...   days used between two dates, inclusive (default today)
+    POST /employees/<id>/usage                         {"days": 2, "date": "YYYY/MM/DD", "note": "..."}
+
+Reads are served from a pool of read-only connections; every write goes through one writer connection
+behind a lock, so other tools get the same accrual rules as VacationApp instead of writing SQL of their own.
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import main
+
+BUSY_TIMEOUT_SECONDS = 5
+MAX_ID = 2 ** 63 - 1  # SQLite INTEGER PRIMARY KEY range
+EMPLOYEE_FIELDS = ("id", "employee_number", "name", "status", "anniversary", "days_taken", "days_available",
+                   "documents", "archived")
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class DataStore:
+    """A pool of read-only connections plus a single serialized writer connection."""
+
+    def __init__(self, db_path, archive_path, readers=8):
+        # The writer goes first: it creates or migrates the schema (ledger, triggers) and the archive file that
+        # the read-only connections attach
+        self.writer = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        main.init_database(self.writer, archive_path)
+        self.write_lock = threading.Lock()
+        with self.write_lock:
+            # Record any accrual due since the app last ran, exactly as VacationApp.load_data does
+            main.fetch_employee_rows(self.writer.cursor())
+
+        self.readers = queue.Queue()
+        for _ in range(readers):
+            reader = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_SECONDS,
+                                     check_same_thread=False)
+            reader.execute("ATTACH DATABASE ? AS archive", (f"file:{archive_path}?mode=ro",))
+            self.readers.put(reader)
+
+    @contextlib.contextmanager
+    def reader(self):
+        connection = self.readers.get()
+        try:
+            yield connection.cursor()
+        finally:
+            self.readers.put(connection)
+
+    @contextlib.contextmanager
+    def writing(self):
+        with self.write_lock:
+            cur = self.writer.cursor()
+            try:
+                yield cur
+                self.writer.commit()
+            except BaseException:
+                self.writer.rollback()
+                raise
+
+    def close(self):
+        while not self.readers.empty():
+            self.readers.get().close()
+        self.writer.close()
+
+
+def employee_to_dict(row):
+    employee = dict(zip(EMPLOYEE_FIELDS, row))
+    if not employee["archived"]:
+        # Same figure VacationApp shows: today's entitlement minus what has been used
+        anniversary = datetime.datetime.strptime(employee["anniversary"], "%Y/%m/%d")
+        employee["days_available"] = main.calculate_vacation_days(anniversary) - employee["days_taken"]
+    doc_path = employee["documents"]
+    employee["documents"] = [doc.split("|")[0] for doc in doc_path.split(";")] if doc_path else []
+    employee["archived"] = bool(employee["archived"])
+    return employee
+
+
+def parse_id(value):
+    employee_id = int(value)
+    if employee_id > MAX_ID:
+        raise ApiError(404, "Employee not found")
+    return employee_id
+
+
+def parse_date(value, field):
+    try:
+        return datetime.datetime.strptime(value, "%Y/%m/%d").strftime("%Y/%m/%d")
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{field} must be a date in YYYY/MM/DD format")
+
+
+def list_employees(store, params):
+    with store.reader() as cur:
+        rows = main.find_employees(cur, name=params.get("name"), status=params.get("status"),
+                                   include_archived=params.get("include_archived") in ("1", "true"))
+    return [employee_to_dict(row) for row in rows]
+
+
+def get_employee(store, employee_id, params):
+    with store.reader() as cur:
+        cur.execute("SELECT id, employee_number, name, status, anniversary, days_taken, days_available, document_path, 0 "
+                    "FROM employees WHERE id = ? UNION ALL "
+                    "SELECT id, employee_number, name, status, anniversary, days_taken, days_available, document_path, 1 "
+                    "FROM archive.employees WHERE id = ?", (employee_id, employee_id))
+        row = cur.fetchone()
+    if not row:
+        raise ApiError(404, "Employee not found")
+    return employee_to_dict(row)
+
+
+def get_balance(store, employee_id, params):
+    as_of = parse_date(params.get("as_of", main.ledger_date()), "as_of")
+    with store.reader() as cur:
+        cur.execute("SELECT 1 FROM employees WHERE id = ?", (employee_id,))
+        if not cur.fetchone():
+            raise ApiError(404, "Employee not found")
+        # The entitlement comes from the accrual rule, like employee_to_dict, so both agree even when no write
+        # has recorded today's accrual grant yet
+        days_granted, days_taken, days_available = main.balance_as_of(cur, employee_id, as_of)
+    return {"id": employee_id, "as_of": as_of, "days_granted": days_granted, "days_taken": days_taken,
+            "days_available": days_available}
+
+
+def get_usage(store, employee_id, params):
+    end = parse_date(params.get("to", main.ledger_date()), "to")
+    start = parse_date(params.get("from", end), "from")
+    if start > end:
+        raise ApiError(400, "from must not be after to")
+    with store.reader() as cur:
+        cur.execute("SELECT 1 FROM employees WHERE id = ?", (employee_id,))
+        if not cur.fetchone():
+            raise ApiError(404, "Employee not found")
+        days_taken = main.days_taken_between(cur, employee_id, start, end)
+    return {"id": employee_id, "from": start, "to": end, "days_taken": days_taken}
+
+
+def post_usage(store, employee_id, body):
+    days = body.get("days")
+    if not isinstance(days, int) or isinstance(days, bool) or days == 0:
+        raise ApiError(400, "days must be a non-zero integer")
+    entry_date = parse_date(body.get("date", main.ledger_date()), "date")
+    note = body.get("note") or "API"
+    if not isinstance(note, str):
+        raise ApiError(400, "note must be a string")
+
+    with store.writing() as cur:
+        cur.execute("SELECT anniversary, days_taken, days_available FROM employees WHERE id = ?", (employee_id,))
+        row = cur.fetchone()
+        if not row:
+            raise ApiError(404, "Employee not found")
+        anniversary_str, days_taken, days_available = row
+        total_days = main.calculate_vacation_days(datetime.datetime.strptime(anniversary_str, "%Y/%m/%d"))
+        days_available = main.accrue_vacation_days(cur, employee_id, total_days, days_taken, days_available)
+        if days > days_available or days_taken + days < 0:
+            raise ApiError(409, f"Cannot use {days} days: {days_available} available, {days_taken} taken")
+        main.record_vacation_entry(cur, employee_id, "usage", days, entry_date, note)
+    return {"id": employee_id, "days_taken": days_taken + days, "days_available": days_available - days}
+
+
+ROUTES = [
+    ("GET", re.compile(r"^/employees$"), lambda store, match, params, body: list_employees(store, params)),
+    ("GET", re.compile(r"^/employees/(\d+)$"),
+     lambda store, match, params, body: get_employee(store, parse_id(match.group(1)), params)),
+    ("GET", re.compile(r"^/employees/(\d+)/balance$"),
+     lambda store, match, params, body: get_balance(store, parse_id(match.group(1)), params)),
+    ("GET", re.compile(r"^/employees/(\d+)/usage$"),
+     lambda store, match, params, body: get_usage(store, parse_id(match.group(1)), params)),
+    ("POST", re.compile(r"^/employees/(\d+)/usage$"),
+     lambda store, match, params, body: post_usage(store, parse_id(match.group(1)), body)),
+]
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store = None
+    verbose = False
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            body = {}
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                # The body can't be read (or skipped) safely, so don't reuse the connection either
+                self.close_connection = True
+                raise ApiError(400, "Content-Length must be a non-negative integer")
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length))
+                except ValueError:
+                    raise ApiError(400, "Request body must be JSON")
+                if not isinstance(body, dict):
+                    raise ApiError(400, "Request body must be a JSON object")
+            for route_method, pattern, handler in ROUTES:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    self.send_json(200, handler(self.store, match, params, body))
+                    return
+            raise ApiError(404, "Not found")
+        except ApiError as e:
+            self.send_json(e.status, {"error": str(e)})
+        except sqlite3.Error as e:
+            self.send_json(503, {"error": f"Database error: {e}"})
+        except Exception:
+            # Always reported, unlike the request log that log_message only writes with --verbose
+            traceback.print_exc()
+            self.send_json(500, {"error": "Internal server error"})
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host="127.0.0.1", port=8765, readers=8, db_path=None, archive_path=None):
+    db_path = db_path or main.db_file
+    # Same naming rule as main.archive_file, so a database passed in gets its own archive
+    archive_path = archive_path or os.path.splitext(db_path)[0] + "_archive.db"
+    store = DataStore(db_path, archive_path, readers)
+    handler = type("BoundApiHandler", (ApiHandler,), {"store": store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the vacation tracker data as a local JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--readers", type=int, default=8, help="size of the read-only connection pool")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    ApiHandler.verbose = args.verbose
+    server, store = make_server(args.host, args.port, args.readers)
+    print(f"Serving {main.db_file} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        store.close()
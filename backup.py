@@ -0,0 +1,205 @@
+"""Online backups and restores of employees.db through SQLite's backup API.
+
+Backups copy BACKUP_PAGES pages per step from their own connection, sleeping between steps so the app's
+writers are only ever locked out for one short step. The main database and its attached archive are
+snapshotted together as a set sharing one timestamp and gzip-compressed under BACKUP_DIR. Scheduled backups are
+skipped while neither file has changed since the newest set. Rotation keeps the newest KEEP_BACKUPS sets, plus the
+newest set of each of the last KEEP_DAILY days and KEEP_WEEKLY weeks.
+"""
+import contextlib
+import datetime
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+BACKUP_DIR = os.environ.get("VAC_APP_BACKUP_DIR", os.path.join(os.path.dirname(__file__), "backups"))
+BACKUP_PAGES = 64
+BACKUP_STEP_SLEEP = 0.005
+BACKUP_ATTEMPTS = 3
+BUSY_TIMEOUT_SECONDS = 30
+KEEP_BACKUPS = 10
+KEEP_DAILY = 14
+KEEP_WEEKLY = 8
+BACKUP_INTERVAL_MINUTES = 60
+STAMP_FORMAT = "%Y%m%d-%H%M%S-%f"
+
+
+def _stem(db_path):
+    return os.path.splitext(os.path.basename(db_path))[0]
+
+
+def list_backup_sets(db_paths, backup_dir=BACKUP_DIR):
+    """[(stamp, {db_path: snapshot path or None})] for every set containing the first database, newest first."""
+    if not os.path.isdir(backup_dir):
+        return []
+    names = set(os.listdir(backup_dir))
+    prefix = _stem(db_paths[0]) + "-"
+    # Timestamps sort lexicographically, so name order is chronological
+    stamps = sorted((name[len(prefix):-len(".db.gz")] for name in names
+                     if name.startswith(prefix) and name.endswith(".db.gz")), reverse=True)
+    sets = []
+    for stamp in stamps:
+        members = {}
+        for db_path in db_paths:
+            name = f"{_stem(db_path)}-{stamp}.db.gz"
+            members[db_path] = os.path.join(backup_dir, name) if name in names else None
+        sets.append((stamp, members))
+    return sets
+
+
+def backup_set_for(snapshot_path, db_paths):
+    """The set ({db_path: snapshot path or None}) that `snapshot_path` belongs to, or None if it matches no database."""
+    backup_dir, name = os.path.split(snapshot_path)
+    for db_path in db_paths:
+        prefix = _stem(db_path) + "-"
+        if name.startswith(prefix) and name.endswith(".db.gz"):
+            stamp = name[len(prefix):-len(".db.gz")]
+            members = {}
+            for member in db_paths:
+                path = os.path.join(backup_dir, f"{_stem(member)}-{stamp}.db.gz")
+                members[member] = path if os.path.exists(path) else None
+            return members
+    return None
+
+
+def needs_backup(db_paths, backup_dir=BACKUP_DIR):
+    """True unless every database is unmodified since the newest set was started."""
+    sets = list_backup_sets(db_paths, backup_dir)
+    if not sets:
+        return True
+    taken_at = datetime.datetime.strptime(sets[0][0], STAMP_FORMAT).timestamp()
+    return any(os.path.getmtime(db_path) >= taken_at for db_path in db_paths if os.path.exists(db_path))
+
+
+def rotate_backups(db_paths, backup_dir=BACKUP_DIR, keep=KEEP_BACKUPS, keep_daily=KEEP_DAILY, keep_weekly=KEEP_WEEKLY):
+    sets = list_backup_sets(db_paths, backup_dir)
+    kept = {stamp for stamp, _ in sets[:keep]}
+    # Sets are newest first, so the first one seen for a day or week is the one that period keeps
+    days, weeks = {}, {}
+    for stamp, _ in sets:
+        taken_at = datetime.datetime.strptime(stamp, STAMP_FORMAT)
+        days.setdefault(taken_at.date(), stamp)
+        weeks.setdefault(taken_at.isocalendar()[:2], stamp)
+    kept.update(list(days.values())[:keep_daily])
+    kept.update(list(weeks.values())[:keep_weekly])
+
+    for stamp, members in sets:
+        if stamp not in kept:
+            for path in members.values():
+                if path:
+                    os.remove(path)
+
+
+def _data_versions(connection, schemas):
+    return [connection.execute(f"PRAGMA {schema}.data_version").fetchone()[0] for schema in schemas]
+
+
+def _copy_schemas(source, schemas, partial_paths, pages):
+    for schema, partial_path in zip(schemas, partial_paths):
+        target = sqlite3.connect(partial_path)
+        try:
+            source.backup(target, pages=pages, name=schema, sleep=BACKUP_STEP_SLEEP)
+        finally:
+            target.close()
+
+
+def backup_database_set(db_paths, backup_dir=BACKUP_DIR, keep=KEEP_BACKUPS):
+    """Snapshot `db_paths` (the main database first, then the ones it attaches) as one consistent set.
+
+    Each file is copied in small steps. If another connection commits to any of them before the whole set
+    is copied, the copy is retried, and the last attempt copies everything inside one read transaction so
+    the set always reflects a single point in time. Returns the compressed snapshot paths.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime(STAMP_FORMAT)
+    snapshot_paths = [os.path.join(backup_dir, f"{_stem(db_path)}-{stamp}.db") for db_path in db_paths]
+    partial_paths = [path + ".partial" for path in snapshot_paths]
+
+    source = sqlite3.connect(db_paths[0], timeout=BUSY_TIMEOUT_SECONDS)
+    schemas = ["main"]
+    try:
+        for index, db_path in enumerate(db_paths[1:]):
+            schemas.append(f"set{index}")
+            source.execute(f"ATTACH DATABASE ? AS set{index}", (db_path,))
+
+        for _ in range(BACKUP_ATTEMPTS - 1):
+            versions = _data_versions(source, schemas)
+            _copy_schemas(source, schemas, partial_paths, BACKUP_PAGES)
+            if _data_versions(source, schemas) == versions:
+                break
+        else:
+            # Writers kept landing between the files: hold a shared lock on all of them for one full copy
+            source.execute("BEGIN")
+            for schema in schemas:
+                source.execute(f"SELECT COUNT(*) FROM {schema}.sqlite_master").fetchone()
+            _copy_schemas(source, schemas, partial_paths, -1)
+            source.execute("COMMIT")
+    finally:
+        source.close()
+
+    try:
+        for snapshot_path, partial_path in zip(snapshot_paths, partial_paths):
+            with open(partial_path, "rb") as src, gzip.open(snapshot_path + ".gz.partial", "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(snapshot_path + ".gz.partial", snapshot_path + ".gz")
+    finally:
+        for partial_path in partial_paths:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    rotate_backups(db_paths, backup_dir, keep)
+    return [path + ".gz" for path in snapshot_paths]
+
+
+@contextlib.contextmanager
+def open_snapshot(backup_path):
+    """Decompress a snapshot to a temporary database file and yield its path."""
+    fd, temp_path = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(backup_path))
+    try:
+        with os.fdopen(fd, "wb") as dst, gzip.open(backup_path, "rb") as src:
+            shutil.copyfileobj(src, dst)
+        yield temp_path
+    finally:
+        os.remove(temp_path)
+
+
+def restore_database(connection, backup_path):
+    """Overwrite the database behind `connection` with a compressed snapshot.
+
+    The restore goes through the backup API into the live connection, so it happens in one step and
+    existing cursors see the restored data without reopening the file.
+    """
+    connection.commit()
+    with open_snapshot(backup_path) as temp_path:
+        source = sqlite3.connect(temp_path)
+        try:
+            source.backup(connection)
+        finally:
+            source.close()
+
+
+class BackupJob(threading.Thread):
+    """Runs backup_database_set on a daemon thread; poll is_alive() and read `result` or `error` afterwards.
+
+    Unless `force` is set, nothing is written (and `result` stays empty) when the databases are unchanged.
+    """
+
+    def __init__(self, db_paths, backup_dir=BACKUP_DIR, keep=KEEP_BACKUPS, force=True):
+        super().__init__(daemon=True)
+        self.db_paths = db_paths
+        self.force = force
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.result = []
+        self.error = None
+
+    def run(self):
+        try:
+            if not self.force and not needs_backup(self.db_paths, self.backup_dir):
+                return
+            self.result = backup_database_set(self.db_paths, self.backup_dir, self.keep)
+        except (sqlite3.Error, OSError) as e:
+            self.error = e
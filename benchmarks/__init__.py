@@ -0,0 +1 @@
+"""Synthetic-data benchmarks for the vacation tracker's hot paths."""
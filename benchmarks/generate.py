@@ -0,0 +1,123 @@
+"""Deterministic generator for synthetic employee databases and sample documents.
+
+Usage: python -m benchmarks.generate [--sizes 1k 100k 1M] [--data-dir benchmarks/data]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import sqlite3
+
+from PIL import Image, ImageDraw
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1M": 1_000_000}
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+SEED = 20250101
+DOCUMENT_COUNT = 8
+
+# main opens its database at import time; point it at a scratch file instead of employees.db
+os.makedirs(DATA_DIR, exist_ok=True)
+os.environ["VAC_APP_DB"] = os.path.join(DATA_DIR, "scratch.db")
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+
+FIRST_NAMES = ["Ana", "Luis", "Jorge", "Pedro", "Alex", "Maria", "Jesus", "Carmen", "Jose", "Rosa", "Carlos",
+               "Sofia", "Miguel", "Lucia", "Juan", "Elena", "David", "Isabel", "Daniel", "Laura", "Michael",
+               "Sarah", "James", "Emily", "Robert", "Jennifer", "William", "Linda", "Fernando", "Gabriela"]
+LAST_NAMES = ["Garcia", "Martinez", "Gonzalez", "Rodriguez", "Lopez", "Hernandez", "Perez", "Sanchez", "Ramirez",
+              "Torres", "Flores", "Rivera", "Gomez", "Diaz", "Colon", "Cruz", "Morales", "Ortiz", "Reyes", "Smith",
+              "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis", "Wilson", "Infante", "Vega", "Castro"]
+
+
+def generate_documents(directory, seed=SEED):
+    """Write DOCUMENT_COUNT scanned-looking A4 pages as both JPEG and PDF. Returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(DOCUMENT_COUNT):
+        jpg_path = os.path.join(directory, f"request_{i}.jpg")
+        pdf_path = os.path.join(directory, f"request_{i}.pdf")
+        if not (os.path.exists(jpg_path) and os.path.exists(pdf_path)):
+            # A4 at 200 dpi, like the phone/copier scans clerks upload
+            img = Image.new("RGB", (1654, 2339), "white")
+            draw = ImageDraw.Draw(img)
+            draw.rectangle((120, 120, 1534, 320), outline="black", width=4)
+            draw.text((160, 180), f"Vacation request #{i}", fill="black")
+            y = 400
+            while y < 2200:
+                width = rng.randint(600, 1400)
+                draw.line((140, y, 140 + width, y), fill=(rng.randint(0, 80),) * 3, width=rng.randint(2, 6))
+                y += rng.randint(30, 60)
+            img.save(jpg_path, "JPEG", quality=85)
+            img.save(pdf_path, "PDF", resolution=200)
+        paths.extend([jpg_path, pdf_path])
+    return paths
+
+
+def generate_database(path, count, documents, seed=SEED, today=None):
+    """Create a legacy-shaped employees.db with `count` employees (no ledger yet, some dash-formatted dates)."""
+    if os.path.exists(path):
+        os.remove(path)
+    rng = random.Random(seed + count)
+    today = today or datetime.datetime(2025, 1, 1)
+    connection = sqlite3.connect(path)
+    connection.execute('''CREATE TABLE employees (
+                            id INTEGER PRIMARY KEY,
+                            employee_number INTEGER,
+                            name TEXT,
+                            status TEXT,
+                            anniversary DATE,
+                            days_taken INTEGER,
+                            days_available INTEGER,
+                            document_path TEXT)''')
+
+    def rows():
+        for employee_id in range(1, count + 1):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            if rng.random() < 0.3:
+                name += f" {rng.choice(LAST_NAMES)}"
+            status = "Temp" if rng.random() < 0.15 else "Company"
+            employee_number = None if status == "Temp" else employee_id % 1000
+            # Tenure is skewed towards recent hires, with a long tail of veterans
+            tenure_days = min(int(rng.expovariate(1 / (5 * 365))) + 30, 40 * 365)
+            anniversary = today - datetime.timedelta(days=tenure_days)
+            date_format = "%Y-%m-%d" if rng.random() < 0.1 else "%Y/%m/%d"
+            total_days = main.calculate_vacation_days(anniversary, today)
+            days_taken = rng.randint(0, total_days) if total_days else 0
+            doc_count = rng.choices([0, 1, 2, 3], weights=[50, 30, 15, 5])[0]
+            docs = []
+            for _ in range(doc_count):
+                doc = rng.choice(documents)
+                docs.append(f"{os.path.basename(doc)}|{doc}")
+            yield (employee_id, employee_number, name, status, anniversary.strftime(date_format), days_taken,
+                   total_days - days_taken, ";".join(docs) or None)
+
+    connection.executemany("INSERT INTO employees VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows())
+    connection.commit()
+    connection.close()
+    return path
+
+
+def dataset_path(size, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"employees_{size}.db")
+
+
+def ensure_dataset(size, data_dir=DATA_DIR):
+    """Return the path of the dataset for `size`, generating it (and the documents) if missing."""
+    documents = generate_documents(os.path.join(data_dir, "documents"))
+    path = dataset_path(size, data_dir)
+    if not os.path.exists(path):
+        print(f"Generating {size} dataset at {path}...")
+        generate_database(path, SIZES[size], documents)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic benchmark databases.")
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=list(SIZES))
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args()
+    for size_name in args.sizes:
+        ensure_dataset(size_name, args.data_dir)
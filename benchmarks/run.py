@@ -0,0 +1,195 @@
+"""Headless timing and peak-memory benchmarks for the app's hot paths.
+
+Usage: python -m benchmarks.run [--sizes 1k 100k] [--repeat N] [--output benchmarks/results.json]
+                                [--baseline benchmarks/baseline.json] [--threshold 1.5] [--noise 0.1]
+                                [--update-baseline]
+
+Each path is timed on a fresh copy of the synthetic dataset (best of --repeat runs, by default more for the
+smaller datasets whose millisecond timings are noisiest) and then run once more
+under tracemalloc for its peak Python heap. The Tk widgets are not involved: the benchmarks drive the same
+module-level functions VacationApp calls (init_database, fetch_employee_rows, build_report, load_preview_image).
+Exits with status 1 if any path is slower than its baseline by more than --threshold. Differences within the
+noise floor (--noise times the baseline, and never less than MIN_SECONDS of timer and scheduler jitter) are
+ignored even with a tight --threshold.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generate import DATA_DIR, SIZES, ensure_dataset
+
+# benchmarks.generate has already imported main against a scratch database instead of employees.db
+import main
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results.json")
+REPEAT = {"1k": 15, "100k": 5, "1M": 3}
+NOISE = 0.1
+MIN_SECONDS = 0.002
+
+
+def fresh_copy(source, name):
+    target = os.path.join(DATA_DIR, name)
+    shutil.copyfile(source, target)
+    return target
+
+
+def measure(setup, func, repeat):
+    """Best-of-`repeat` wall time and the peak traced allocation of one extra run.
+
+    `setup` returns the argument passed to `func`; it is not included in the timing.
+    """
+    best = None
+    for _ in range(repeat):
+        arg = setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(arg)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    arg = setup()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(best, 6), "peak_bytes": peak}
+
+
+def bench_size(size, repeat):
+    source = ensure_dataset(size)
+    results = {}
+    connections = []
+
+    def connect(path):
+        connection = sqlite3.connect(path)
+        connections.append(connection)
+        return connection
+
+    def close_all():
+        while connections:
+            connections.pop().close()
+
+    try:
+        results["startup_migration"] = measure(lambda: connect(fresh_copy(source, "work.db")),
+                                               main.init_database, repeat)
+        close_all()
+        migrated = fresh_copy(os.path.join(DATA_DIR, "work.db"), f"migrated_{size}.db")
+
+        results["load_data"] = measure(lambda: connect(fresh_copy(migrated, "work.db")).cursor(),
+                                       main.fetch_employee_rows, repeat)
+        close_all()
+        results["refresh_days"] = measure(lambda: connect(fresh_copy(migrated, "work.db")).cursor(),
+                                          lambda cur: main.fetch_employee_rows(cur, sort_by_last_name=True), repeat)
+        close_all()
+
+        # print_database with every employee selected
+        cur = connect(migrated).cursor()
+        employee_ids = [row[0] for row in cur.execute("SELECT id FROM employees ORDER BY id")]
+        results["print_database"] = measure(lambda: cur, lambda c: main.build_report(c, employee_ids), repeat)
+
+        for extension in ("jpg", "pdf"):
+            cur.execute("SELECT id, document_path FROM employees WHERE document_path LIKE ? ORDER BY id LIMIT 1",
+                        (f"%.{extension}%",))
+            employee_id, _ = cur.fetchone()
+
+            def preview(c, employee_id=employee_id, extension=extension):
+                # Same work as update_preview: fetch the document list, then render the chosen file
+                c.execute("SELECT document_path FROM employees WHERE id = ?", (employee_id,))
+                doc_list = c.fetchone()[0].split(";")
+                file_path = next(doc.split("|", 1)[1] for doc in doc_list if doc.endswith(f".{extension}"))
+                main.load_preview_image(file_path, 1.0)
+
+            try:
+                results[f"update_preview_{extension}"] = measure(lambda: cur, preview, repeat)
+            except Exception as e:
+                # PDF previews need poppler on PATH; report the path as skipped rather than failing the suite
+                results[f"update_preview_{extension}"] = {"skipped": f"{type(e).__name__}: {e}"}
+    finally:
+        close_all()
+    return results
+
+
+def compare(results, baseline, threshold, noise=NOISE):
+    """Return a list of (size, path, seconds, baseline_seconds) that regressed past `threshold`.
+
+    A path only counts as regressed when it is also slower by more than the noise floor: `noise` times its
+    baseline, or MIN_SECONDS for paths so fast that timer jitter dominates.
+    """
+    regressions = []
+    for size, paths in results.items():
+        for path, result in paths.items():
+            expected = baseline.get(size, {}).get(path, {}).get("seconds")
+            seconds = result.get("seconds")
+            if (expected and seconds and seconds > expected * threshold
+                    and seconds - expected > max(expected * noise, MIN_SECONDS)):
+                regressions.append((size, path, seconds, expected))
+    return regressions
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the vacation tracker's hot paths.")
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=["1k", "100k"])
+    parser.add_argument("--repeat", type=int,
+                        help="timed runs per path (default: " + ", ".join(f"{n} for {size}" for size, n in REPEAT.items()) + ")")
+    parser.add_argument("--output", default=RESULTS_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="fail when a path takes longer than baseline * threshold")
+    parser.add_argument("--noise", type=float, default=NOISE,
+                        help="ignore slowdowns smaller than this fraction of the baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="merge these results into the baseline file instead of comparing")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        results[size] = bench_size(size, args.repeat or REPEAT[size])
+        for path, result in results[size].items():
+            if "skipped" in result:
+                print(f"{size:>5} {path:<22} skipped ({result['skipped']})")
+            else:
+                print(f"{size:>5} {path:<22} {result['seconds']:>10.4f}s {result['peak_bytes'] / 2**20:>9.1f} MiB")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        for size, paths in results.items():
+            baseline.setdefault(size, {}).update(paths)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold, args.noise)
+    for size, path, seconds, expected in regressions:
+        print(f"REGRESSION {size} {path}: {seconds:.4f}s vs baseline {expected:.4f}s "
+              f"(> {args.threshold:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,86 @@
+"""Cold-start timings for the app run from source and as frozen PyInstaller builds.
+
+Usage: python -m benchmarks.startup [--frozen dist/main.exe dist/main/main.exe] [--runs 5]
+                                    [--output benchmarks/startup.json]
+
+Each run launches the app with VAC_APP_STARTUP_PROBE set (which skips the 5 s splash delay and exits once the
+main window is up) against a scratch copy of employees.db, and reports the time from launch to:
+  imports      - main.py has finished importing (bootloader unpacking and library imports)
+  splash       - SplashScreen is on screen (time-to-first-splash)
+  interactive  - VacationApp has loaded its data and is idle (time-to-interactive)
+Needs a display, like the app itself.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_FILE = os.path.join(os.path.dirname(__file__), "startup.json")
+EVENTS = ("imports", "splash", "interactive")
+TIMEOUT_SECONDS = 120
+
+
+def launch_once(command, work_dir):
+    """Start the app once and return {event: ms since launch}."""
+    probe = os.path.join(work_dir, "probe.jsonl")
+    if os.path.exists(probe):
+        os.remove(probe)
+    db_path = os.path.join(work_dir, "employees.db")
+    shutil.copyfile(os.path.join(REPO_DIR, "employees.db"), db_path)
+    env = dict(os.environ, VAC_APP_STARTUP_PROBE=probe, VAC_APP_DB=db_path,
+               VAC_APP_BACKUP_DIR=os.path.join(work_dir, "backups"))
+
+    start = time.time()
+    completed = subprocess.run(command, env=env, cwd=work_dir, timeout=TIMEOUT_SECONDS,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{command[0]} exited with {completed.returncode}: {completed.stderr.decode()[-500:]}")
+
+    marks = {}
+    with open(probe) as f:
+        for line in f:
+            mark = json.loads(line)
+            marks.setdefault(mark["event"], round((mark["time"] - start) * 1000, 1))
+    return marks
+
+
+def measure(label, command, runs):
+    work_dir = tempfile.mkdtemp(prefix="vac_app_startup_")
+    try:
+        samples = [launch_once(command, work_dir) for _ in range(runs)]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    summary = {}
+    for event in EVENTS:
+        values = [sample[event] for sample in samples if event in sample]
+        if values:
+            summary[event] = {"median_ms": statistics.median(values), "min_ms": min(values), "max_ms": max(values)}
+    print(f"{label:<40} " + "  ".join(
+        f"{event} {summary[event]['median_ms']:>8.1f} ms" for event in EVENTS if event in summary))
+    return {"command": command, "runs": runs, "events": summary}
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Measure time-to-first-splash and time-to-interactive.")
+    parser.add_argument("--frozen", nargs="*", default=[], help="paths to PyInstaller-built executables")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args(argv)
+
+    targets = [("source", [sys.executable, os.path.join(REPO_DIR, "main.py")])]
+    targets += [(path, [os.path.abspath(path)]) for path in args.frozen]
+
+    results = {label: measure(label, command, args.runs) for label, command in targets}
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,314 @@
+"""Opt-in hot-path instrumentation: SQL timings, method spans and Tk event-loop stalls.
+
+Turn it on with VAC_APP_DIAGNOSTICS=1 (or from the hidden diagnostics window, Ctrl+Shift+D).
+Events go to an in-memory ring buffer shown in that window and to a rotating JSON-lines log.
+The app's connection is a TimedConnection, so every statement and commit on it is timed through TimedCursor.
+While disabled, the span decorator, TimedConnection and TimedCursor only check a module flag before calling through.
+"""
+import collections
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import sqlite3
+import time
+import tkinter as tk
+from tkinter import ttk
+
+enabled = os.environ.get("VAC_APP_DIAGNOSTICS") == "1"
+
+LOG_FILE = os.environ.get("VAC_APP_DIAGNOSTICS_LOG", os.path.join(os.path.dirname(__file__), "diagnostics.log"))
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+SLOW_QUERY_MS = 50
+STALL_THRESHOLD_MS = 200
+LOOP_INTERVAL_MS = 100
+MAX_EVENTS = 500
+
+events = collections.deque(maxlen=MAX_EVENTS)
+query_stats = {}  # sql -> [count, total_ms, max_ms]
+
+_logger = None
+_traced_statements = []
+_monitor = None
+
+
+def _get_logger():
+    global _logger
+    if _logger is None:
+        _logger = logging.getLogger("vac_app.diagnostics")
+        _logger.setLevel(logging.INFO)
+        _logger.propagate = False
+        handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES,
+                                                       backupCount=LOG_BACKUP_COUNT)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _logger.addHandler(handler)
+    return _logger
+
+
+def record(kind, name, duration_ms, **extra):
+    event = {"time": round(time.time(), 3), "kind": kind, "name": name, "duration_ms": round(duration_ms, 3), **extra}
+    events.append(event)
+    _get_logger().info(json.dumps(event))
+
+
+def timed(name):
+    """Decorator recording a 'span' event for each call while instrumentation is enabled."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record("span", name, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
+
+
+def _on_statement(statement):
+    # SQLite trace callback: also sees the statements run by triggers, which the cursor never does
+    _traced_statements.append(statement)
+
+
+def _add_query_time(sql, duration_ms, executed):
+    stats = query_stats.setdefault(sql, [0, 0.0, 0.0])
+    stats[0] += executed
+    stats[1] += duration_ms
+    return stats
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that aggregates per-statement timings into query_stats while enabled.
+
+    SQLite does most of a SELECT's work while rows are stepped, so time spent in fetchone/fetchmany/fetchall
+    and iteration is added to the statement that produced the rows. A statement's time is complete, and checked
+    against SLOW_QUERY_MS, once its rows are exhausted or the cursor runs its next statement.
+    """
+    _sql = None
+    _elapsed_ms = 0.0
+
+    def _begin(self, sql, start):
+        duration_ms = (time.perf_counter() - start) * 1000
+        stats = _add_query_time(sql, duration_ms, 1)
+        stats[2] = max(stats[2], duration_ms)
+        self._sql = sql
+        self._elapsed_ms = duration_ms
+
+    def _fetched(self, start, exhausted):
+        if self._sql is None:
+            return
+        duration_ms = (time.perf_counter() - start) * 1000
+        self._elapsed_ms += duration_ms
+        stats = _add_query_time(self._sql, duration_ms, 0)
+        stats[2] = max(stats[2], self._elapsed_ms)
+        if exhausted:
+            self._finish()
+
+    def _finish(self):
+        if self._sql is not None and self._elapsed_ms >= SLOW_QUERY_MS:
+            record("query", " ".join(self._sql.split()), self._elapsed_ms, statements=len(_traced_statements))
+        self._sql = None
+
+    def execute(self, sql, parameters=()):
+        if not enabled:
+            return super().execute(sql, parameters)
+        # Report the previous statement while the trace buffer still holds its statements
+        self._finish()
+        _traced_statements.clear()
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._begin(sql, start)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not enabled:
+            return super().executemany(sql, seq_of_parameters)
+        # Report the previous statement while the trace buffer still holds its statements
+        self._finish()
+        _traced_statements.clear()
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._begin(sql, start)
+
+    def fetchone(self):
+        if not enabled:
+            return super().fetchone()
+        start = time.perf_counter()
+        row = None
+        try:
+            row = super().fetchone()
+            return row
+        finally:
+            self._fetched(start, row is None)
+
+    def fetchmany(self, size=None):
+        if not enabled:
+            return super().fetchmany(self.arraysize if size is None else size)
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = []
+        try:
+            rows = super().fetchmany(size)
+            return rows
+        finally:
+            self._fetched(start, len(rows) < size)
+
+    def fetchall(self):
+        if not enabled:
+            return super().fetchall()
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._fetched(start, True)
+
+    def __next__(self):
+        if not enabled:
+            return super().__next__()
+        start = time.perf_counter()
+        exhausted = True
+        try:
+            row = super().__next__()
+            exhausted = False
+            return row
+        finally:
+            self._fetched(start, exhausted)
+
+    def close(self):
+        self._finish()
+        super().close()
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors, including the ones behind execute()/executemany(), are TimedCursors.
+
+    Pass it as sqlite3.connect(..., factory=TimedConnection) so every statement on the connection (schema
+    migrations, ATTACH, helper queries through connection.execute) and each commit reach query_stats.
+    """
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        if not enabled:
+            return super().commit()
+        _traced_statements.clear()
+        start = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            stats = _add_query_time("COMMIT", duration_ms, 1)
+            stats[2] = max(stats[2], duration_ms)
+            if duration_ms >= SLOW_QUERY_MS:
+                record("query", "COMMIT", duration_ms, statements=len(_traced_statements))
+
+
+class EventLoopMonitor:
+    """Schedules a tick every LOOP_INTERVAL_MS and records a 'stall' when it fires late."""
+
+    def __init__(self, root):
+        self.root = root
+        self.expected = None
+        self.after_id = None
+
+    def start(self):
+        self.expected = time.perf_counter() + LOOP_INTERVAL_MS / 1000
+        self.after_id = self.root.after(LOOP_INTERVAL_MS, self.tick)
+
+    def stop(self):
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def tick(self):
+        lag_ms = (time.perf_counter() - self.expected) * 1000
+        if lag_ms > STALL_THRESHOLD_MS:
+            record("stall", "event_loop", lag_ms)
+        self.start()
+
+
+def enable(connection, root=None):
+    global enabled, _monitor
+    enabled = True
+    connection.set_trace_callback(_on_statement)
+    if root is not None and _monitor is None:
+        _monitor = EventLoopMonitor(root)
+        _monitor.start()
+
+
+def disable(connection):
+    global enabled, _monitor
+    enabled = False
+    connection.set_trace_callback(None)
+    if _monitor is not None:
+        _monitor.stop()
+        _monitor = None
+
+
+def show_window(root, connection):
+    """Open the diagnostics window listing recent events and aggregated query timings."""
+    window = tk.Toplevel(root)
+    window.title("Diagnostics")
+    window.geometry("760x480")
+    window.transient(root)
+
+    status_var = tk.StringVar()
+    controls = tk.Frame(window)
+    controls.pack(fill="x", padx=5, pady=5)
+    tk.Label(controls, textvariable=status_var).pack(side=tk.LEFT)
+
+    events_tree = ttk.Treeview(window, columns=("Time", "Kind", "Name", "ms"), show="headings", height=10)
+    for column, width in (("Time", 90), ("Kind", 60), ("Name", 500), ("ms", 80)):
+        events_tree.heading(column, text=column)
+        events_tree.column(column, width=width, anchor="w" if column == "Name" else "center")
+    events_tree.pack(fill="both", expand=True, padx=5)
+
+    queries_tree = ttk.Treeview(window, columns=("Query", "Count", "Total ms", "Max ms"), show="headings", height=8)
+    for column, width in (("Query", 470), ("Count", 80), ("Total ms", 90), ("Max ms", 90)):
+        queries_tree.heading(column, text=column)
+        queries_tree.column(column, width=width, anchor="w" if column == "Query" else "center")
+    queries_tree.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def refresh():
+        status_var.set(f"Instrumentation {'enabled' if enabled else 'disabled'} - log: {LOG_FILE}")
+        toggle_btn.config(text="Disable" if enabled else "Enable")
+        events_tree.delete(*events_tree.get_children())
+        for event in reversed(events):
+            events_tree.insert("", "end", values=(time.strftime("%H:%M:%S", time.localtime(event["time"])),
+                                                  event["kind"], event["name"], f"{event['duration_ms']:.1f}"))
+        queries_tree.delete(*queries_tree.get_children())
+        for sql, (count, total_ms, max_ms) in sorted(query_stats.items(), key=lambda item: -item[1][1]):
+            queries_tree.insert("", "end", values=(" ".join(sql.split()), count, f"{total_ms:.1f}", f"{max_ms:.1f}"))
+
+    def toggle():
+        if enabled:
+            disable(connection)
+        else:
+            enable(connection, root)
+        refresh()
+
+    def clear():
+        events.clear()
+        query_stats.clear()
+        refresh()
+
+    toggle_btn = ttk.Button(controls, command=toggle, style="primary.Toolbutton")
+    toggle_btn.pack(side=tk.RIGHT, padx=2)
+    ttk.Button(controls, text="Clear", command=clear, style="danger.Toolbutton").pack(side=tk.RIGHT, padx=2)
+    ttk.Button(controls, text="Refresh", command=refresh, style="primary.Toolbutton").pack(side=tk.RIGHT, padx=2)
+    refresh()
+    return window
@@ -2,57 +2,34 @@ import tkinter as tk
 from ttkbootstrap import Style, Button, Treeview, OptionMenu, Label, Entry, Frame
 from ttkbootstrap.dialogs import Messagebox
 from tkinter import ttk, filedialog
+import contextlib
 import datetime
+import json
+import shutil
 import sqlite3
+import tempfile
+import time
 from PIL import Image, ImageTk
 import os
 from pdf2image import convert_from_path
+import diagnostics
+import backup
 
 # Database setup
-db_file = os.path.join(os.path.dirname(__file__), "employees.db")
-conn = sqlite3.connect(db_file)
+db_file = os.environ.get("VAC_APP_DB", os.path.join(os.path.dirname(__file__), "employees.db"))
+archive_file = os.path.splitext(db_file)[0] + "_archive.db"
+conn = sqlite3.connect(db_file, factory=diagnostics.TimedConnection)
 cursor = conn.cursor()
 
+# Set by benchmarks/startup.py: milestones are appended to this file and the app exits once interactive
+STARTUP_PROBE = os.environ.get("VAC_APP_STARTUP_PROBE")
+SPLASH_DURATION_MS = 0 if STARTUP_PROBE else 5000
+
 expected_columns = ["id", "name", "employee_number", "status", "anniversary", "days_taken", "days_available", "document_path"]
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='employees'")
-table_exists = cursor.fetchone()
+SNAPSHOT_INTERVAL_DAYS = 30
 
-if not table_exists:
-    cursor.execute('''CREATE TABLE employees (
-                        id INTEGER PRIMARY KEY,
-                        employee_number INTEGER, 
-                        name TEXT,
-                        status TEXT, 
-                        anniversary DATE, 
-                        days_taken INTEGER, 
-                        days_available INTEGER,
-                        document_path TEXT)''')
-    conn.commit()
-    print("Table 'employees' created with correct schema.")
-else:
-    cursor.execute("PRAGMA table_info(employees)")
-    existing_columns = [col[1] for col in cursor.fetchall()]
-    for col in expected_columns:
-        if col not in existing_columns:
-            if col == "id":
-                print("Error: Table exists but 'id' column is missing. Consider resetting the database.")
-            else:
-                col_type = "INTEGER" if col in ["employee_number", "days_taken", "days_available"] else "TEXT"
-                cursor.execute(f"ALTER TABLE employees ADD COLUMN {col} {col_type}")
-                print(f"Added missing column: {col}")
-    conn.commit()
-
-cursor.execute("SELECT id, anniversary FROM employees")
-for row in cursor.fetchall():
-    emp_id, anniversary = row
-    if anniversary and '-' in anniversary:
-        new_anniversary = anniversary.replace('-', '/')
-        cursor.execute("UPDATE employees SET anniversary = ? WHERE id = ?", (new_anniversary, emp_id))
-conn.commit()
-print("Migrated existing dates to YYYY/MM/DD format.")
-
-def calculate_vacation_days(anniversary):
-    today = datetime.datetime.now()
+def calculate_vacation_days(anniversary, as_of=None):
+    today = as_of or datetime.datetime.now()
     years_of_service = (today - anniversary).days / 365.25
     if years_of_service < 2:
         annual_days = 5
@@ -64,6 +41,382 @@ def calculate_vacation_days(anniversary):
         annual_days = 20
     return int(years_of_service * annual_days)
 
+def mark_startup(event):
+    """Record a startup milestone (wall-clock time) when running under the startup probe."""
+    if STARTUP_PROBE:
+        with open(STARTUP_PROBE, "a") as f:
+            f.write(json.dumps({"event": event, "time": time.time()}) + "\n")
+
+mark_startup("imports")
+
+def ledger_date(value=None):
+    """Return a ledger date string (YYYY/MM/DD); defaults to today."""
+    if value is None:
+        value = datetime.date.today()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime("%Y/%m/%d")
+    return value
+
+def record_vacation_entry(cur, employee_id, kind, days, entry_date=None, note=None):
+    """Append a grant or usage to the ledger. The caller is responsible for committing."""
+    entry_date = ledger_date(entry_date)
+    cur.execute("INSERT INTO vacation_ledger (employee_id, entry_date, kind, days, note) VALUES (?, ?, ?, ?, ?)",
+                (employee_id, entry_date, kind, days, note))
+    # A back-dated entry invalidates any snapshot taken on or after its date
+    cur.execute("DELETE FROM vacation_snapshots WHERE employee_id = ? AND snapshot_date >= ?", (employee_id, entry_date))
+
+def accrue_vacation_days(cur, employee_id, total_days, days_taken, days_available):
+    """Grant any accrued days not yet in the ledger and return the resulting days available."""
+    granted = days_taken + days_available
+    if total_days != granted:
+        record_vacation_entry(cur, employee_id, "grant", total_days - granted, note="Accrual")
+    return total_days - days_taken
+
+def days_taken_between(cur, employee_id, start, end):
+    """Total days used by an employee between two dates (inclusive)."""
+    cur.execute("SELECT COALESCE(SUM(days), 0) FROM vacation_ledger "
+                "WHERE employee_id = ? AND entry_date BETWEEN ? AND ? AND kind = 'usage'",
+                (employee_id, ledger_date(start), ledger_date(end)))
+    return cur.fetchone()[0]
+
+def balance_as_of(cur, employee_id, as_of):
+    """Return (days_granted, days_taken, days_available) for an employee as of a date.
+
+    Ledger grants are recorded on whichever day the app next runs, not the day the days were earned, so the
+    entitlement comes from the accrual rule evaluated at the date. Usage is summed from the latest snapshot
+    on or before the date plus the ledger entries recorded after it, an index seek plus a short range scan.
+    """
+    as_of = ledger_date(as_of)
+    cur.execute("SELECT anniversary FROM employees WHERE id = ?", (employee_id,))
+    anniversary = datetime.datetime.strptime(cur.fetchone()[0], "%Y/%m/%d")
+    granted = max(calculate_vacation_days(anniversary, datetime.datetime.strptime(as_of, "%Y/%m/%d")), 0)
+    cur.execute("SELECT snapshot_date, days_taken FROM vacation_snapshots "
+                "WHERE employee_id = ? AND snapshot_date <= ? ORDER BY snapshot_date DESC LIMIT 1",
+                (employee_id, as_of))
+    snapshot = cur.fetchone()
+    since, taken = snapshot if snapshot else ("", 0)
+    cur.execute("SELECT COALESCE(SUM(days), 0) FROM vacation_ledger "
+                "WHERE employee_id = ? AND kind = 'usage' AND entry_date > ? AND entry_date <= ?",
+                (employee_id, since, as_of))
+    taken += cur.fetchone()[0]
+    return granted, taken, granted - taken
+
+def take_vacation_snapshots(cur, snapshot_date=None):
+    """Store each employee's running ledger totals as of a date (yesterday by default)."""
+    if snapshot_date is None:
+        snapshot_date = datetime.date.today() - datetime.timedelta(days=1)
+    snapshot_date = ledger_date(snapshot_date)
+    cur.execute('''INSERT OR REPLACE INTO vacation_snapshots (employee_id, snapshot_date, days_granted, days_taken)
+                   SELECT employee_id, ?,
+                          SUM(CASE WHEN kind = 'grant' THEN days ELSE 0 END),
+                          SUM(CASE WHEN kind = 'usage' THEN days ELSE 0 END)
+                   FROM vacation_ledger WHERE entry_date <= ? GROUP BY employee_id''',
+                (snapshot_date, snapshot_date))
+
+def document_display_name(doc_path):
+    """Name of the most recently uploaded document in a 'name|path;name|path' list."""
+    if doc_path and ";" in doc_path:
+        return doc_path.split(";")[-1].split("|")[0]
+    elif doc_path:
+        return doc_path.split("|")[0]
+    return ""
+
+def fetch_employee_rows(cur, sort_by_last_name=False, include_archived=False):
+    """Return (employee_id, treeview values, archived) for every employee, granting any new accrual on the way.
+
+    Archived employees are only read (from the attached archive database) when include_archived is set.
+    """
+    query = "SELECT id, employee_number, name, status, anniversary, days_taken, days_available, document_path, 0 FROM employees"
+    if include_archived:
+        query += (" UNION ALL SELECT id, employee_number, name, status, anniversary, days_taken, days_available, "
+                  "document_path, 1 FROM archive.employees")
+    if sort_by_last_name:
+        rows = cur.execute(query).fetchall()
+        rows.sort(key=lambda x: x[2].split()[-1] if x[2].split() else x[2])
+    else:
+        rows = cur.execute(query + " ORDER BY id").fetchall()
+
+    result = []
+    for row in rows:
+        employee_id, employee_number, name, status, anniversary, days_taken, days_available, doc_path, archived = row
+        if archived:
+            updated_available = days_available
+        else:
+            anniversary_date = datetime.datetime.strptime(anniversary, "%Y/%m/%d")
+            total_days = calculate_vacation_days(anniversary_date)
+            updated_available = accrue_vacation_days(cur, employee_id, total_days, days_taken, days_available)
+        employee_number_str = "" if employee_number is None else str(employee_number)
+        result.append((employee_id, (name, employee_number_str, status, anniversary, days_taken, updated_available,
+                                     document_display_name(doc_path)), bool(archived)))
+    cur.connection.commit()
+    return result
+
+def find_employees(cur, name=None, status=None, include_archived=False):
+    """Rows of (id, employee_number, name, status, anniversary, days_taken, days_available, document_path, archived)
+    filtered by a name substring and/or exact status."""
+    query = "SELECT id, employee_number, name, status, anniversary, days_taken, days_available, document_path, 0 FROM employees"
+    if include_archived:
+        query += (" UNION ALL SELECT id, employee_number, name, status, anniversary, days_taken, days_available, "
+                  "document_path, 1 FROM archive.employees")
+    conditions, params = [], []
+    if name:
+        conditions.append("name LIKE ?")
+        params.append(f"%{name}%")
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    query = f"SELECT * FROM ({query})"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return cur.execute(query + " ORDER BY id", params).fetchall()
+
+def build_report(cur, employee_ids, include_archived=False):
+    """Format the fixed-width 'Selected Employees Report' for the given employee ids."""
+    query = "SELECT employee_number, name, status, anniversary, days_taken, days_available, document_path FROM employees WHERE id = ?"
+    if include_archived:
+        query += (" UNION ALL SELECT employee_number, name, status, anniversary, days_taken, days_available, document_path "
+                  "FROM archive.employees WHERE id = ?")
+    output = "Selected Employees Report\n"
+    output += "=" * 120 + "\n"
+    header = f"{'Name':<20} {'#':^10} {'Status':^15} {'Anniversary':^20} {'Days Taken':^15} {'Days Available':^15} {'Document':^25}"
+    output += header + "\n"
+    output += "=" * 120 + "\n"
+
+    for employee_id in employee_ids:
+        cur.execute(query, (employee_id, employee_id) if include_archived else (employee_id,))
+        row = cur.fetchone()
+        if row:
+            employee_number, name, status, anniversary, days_taken, days_available, doc_path = row
+            employee_number_str = "" if employee_number is None else str(employee_number)
+            doc_name = document_display_name(doc_path)
+            line = f"{name:<20} {employee_number_str:^10} {status:^15} {anniversary:^20} {days_taken:^15} {days_available:^15} {doc_name:^25}"
+            output += line + "\n"
+
+    output += "=" * 120 + "\n"
+    return output
+
+def load_preview_image(file_path, zoom_level=1.0):
+    """Open a JPEG or the first page of a PDF, scaled for the preview window.
+
+    Returns (image, None) on success or (None, message) when there is nothing to show.
+    """
+    if file_path.lower().endswith(('.jpg', '.jpeg')):
+        img = Image.open(file_path)
+    elif file_path.lower().endswith('.pdf'):
+        images = convert_from_path(file_path, first_page=1, last_page=1)
+        if not images:
+            return None, "PDF is empty"
+        img = images[0]
+    else:
+        return None, "Unsupported file format"
+
+    base_size = 600
+    new_size = int(base_size * zoom_level)
+    img.thumbnail((new_size, new_size))
+    return img, None
+
+def attach_archive(connection, path=None):
+    """Attach the archive database (created on first use) to a connection as schema 'archive'."""
+    if path is None:
+        main_path = connection.execute("PRAGMA database_list").fetchone()[2]
+        path = os.path.splitext(main_path)[0] + "_archive.db"
+    connection.execute("ATTACH DATABASE ? AS archive", (path,))
+    connection.execute('''CREATE TABLE IF NOT EXISTS archive.employees (
+                            id INTEGER PRIMARY KEY,
+                            employee_number INTEGER,
+                            name TEXT,
+                            status TEXT,
+                            anniversary DATE,
+                            days_taken INTEGER,
+                            days_available INTEGER,
+                            document_path TEXT,
+                            archived_on DATE)''')
+    connection.execute('''CREATE TABLE IF NOT EXISTS archive.vacation_ledger (
+                            id INTEGER PRIMARY KEY,
+                            employee_id INTEGER NOT NULL,
+                            entry_date DATE NOT NULL,
+                            kind TEXT NOT NULL,
+                            days INTEGER NOT NULL,
+                            note TEXT)''')
+    connection.execute("CREATE INDEX IF NOT EXISTS archive.idx_vacation_ledger_employee_date "
+                       "ON vacation_ledger (employee_id, entry_date, kind, days)")
+    connection.execute("CREATE INDEX IF NOT EXISTS archive.idx_employees_name ON employees (name)")
+    connection.execute('''CREATE TRIGGER IF NOT EXISTS archive.vacation_ledger_no_update BEFORE UPDATE ON vacation_ledger
+                          BEGIN
+                              SELECT RAISE(ABORT, 'vacation_ledger is append-only');
+                          END''')
+    connection.execute('''CREATE TRIGGER IF NOT EXISTS archive.vacation_ledger_no_delete_active BEFORE DELETE ON vacation_ledger
+                          WHEN EXISTS (SELECT 1 FROM employees WHERE id = OLD.employee_id)
+                          BEGIN
+                              SELECT RAISE(ABORT, 'vacation_ledger is append-only');
+                          END''')
+    connection.commit()
+
+def archive_employees(cur, employee_ids):
+    """Move employees, their documents and their ledger history into the archive database.
+
+    Runs as a single transaction across both databases; the caller commits (or rolls back on error).
+    """
+    archived_on = ledger_date()
+    for employee_id in employee_ids:
+        cur.execute("INSERT INTO archive.employees (id, employee_number, name, status, anniversary, days_taken, "
+                    "days_available, document_path, archived_on) "
+                    "SELECT id, employee_number, name, status, anniversary, days_taken, days_available, document_path, ? "
+                    "FROM employees WHERE id = ?", (archived_on, employee_id))
+        cur.execute("INSERT INTO archive.vacation_ledger (employee_id, entry_date, kind, days, note) "
+                    "SELECT employee_id, entry_date, kind, days, note FROM vacation_ledger WHERE employee_id = ? ORDER BY id",
+                    (employee_id,))
+        # The employee row goes first: ledger rows may only be deleted once nobody active owns them
+        cur.execute("DELETE FROM employees WHERE id = ?", (employee_id,))
+        cur.execute("DELETE FROM vacation_ledger WHERE employee_id = ?", (employee_id,))
+        cur.execute("DELETE FROM vacation_snapshots WHERE employee_id = ?", (employee_id,))
+
+def restore_employees(cur, employee_ids):
+    """Move archived employees back into the live tables. The caller commits.
+
+    Balances are rebuilt by replaying the archived ledger through the vacation_ledger_apply trigger.
+    """
+    for employee_id in employee_ids:
+        cur.execute("INSERT INTO employees (id, employee_number, name, status, anniversary, days_taken, days_available, "
+                    "document_path) SELECT id, employee_number, name, status, anniversary, 0, 0, document_path "
+                    "FROM archive.employees WHERE id = ?", (employee_id,))
+        cur.execute("INSERT INTO vacation_ledger (employee_id, entry_date, kind, days, note) "
+                    "SELECT employee_id, entry_date, kind, days, note FROM archive.vacation_ledger "
+                    "WHERE employee_id = ? ORDER BY id", (employee_id,))
+        cur.execute("DELETE FROM archive.employees WHERE id = ?", (employee_id,))
+        cur.execute("DELETE FROM archive.vacation_ledger WHERE employee_id = ?", (employee_id,))
+
+def delete_employees(cur, employee_ids):
+    """Delete employees together with their ledger history and snapshots. The caller commits."""
+    for employee_id in employee_ids:
+        # As in archive_employees, the employee row goes first so the ledger's delete guard lets its rows go
+        cur.execute("DELETE FROM employees WHERE id = ?", (employee_id,))
+        cur.execute("DELETE FROM vacation_ledger WHERE employee_id = ?", (employee_id,))
+        cur.execute("DELETE FROM vacation_snapshots WHERE employee_id = ?", (employee_id,))
+
+def find_restore_conflicts(db_snapshot, archive_snapshot=None):
+    """Ids that would be in both employees and archive.employees after restoring these snapshots.
+
+    Without an archive snapshot the restored main database is checked against the live archive.
+    """
+    with contextlib.ExitStack() as stack:
+        db_path = stack.enter_context(backup.open_snapshot(db_snapshot))
+        archive_path = stack.enter_context(backup.open_snapshot(archive_snapshot)) if archive_snapshot else archive_file
+        check_conn = sqlite3.connect(db_path)
+        try:
+            check_conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+            if not check_conn.execute("SELECT 1 FROM archive.sqlite_master WHERE name = 'employees'").fetchone():
+                return []
+            return [row[0] for row in check_conn.execute(
+                "SELECT id FROM employees INTERSECT SELECT id FROM archive.employees ORDER BY id")]
+        finally:
+            check_conn.close()
+
+
+@diagnostics.timed("init_database")
+def init_database(connection, archive_path=None):
+    """Create or migrate the schema, attach the archive and take the periodic ledger snapshot if one is due."""
+    cur = connection.cursor()
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='employees'")
+    table_exists = cur.fetchone()
+
+    if not table_exists:
+        cur.execute('''CREATE TABLE employees (
+                            id INTEGER PRIMARY KEY,
+                            employee_number INTEGER, 
+                            name TEXT,
+                            status TEXT, 
+                            anniversary DATE, 
+                            days_taken INTEGER, 
+                            days_available INTEGER,
+                            document_path TEXT)''')
+        connection.commit()
+        print("Table 'employees' created with correct schema.")
+    else:
+        cur.execute("PRAGMA table_info(employees)")
+        existing_columns = [col[1] for col in cur.fetchall()]
+        for col in expected_columns:
+            if col not in existing_columns:
+                if col == "id":
+                    print("Error: Table exists but 'id' column is missing. Consider resetting the database.")
+                else:
+                    col_type = "INTEGER" if col in ["employee_number", "days_taken", "days_available"] else "TEXT"
+                    cur.execute(f"ALTER TABLE employees ADD COLUMN {col} {col_type}")
+                    print(f"Added missing column: {col}")
+        connection.commit()
+
+    cur.execute("SELECT id, anniversary FROM employees")
+    for row in cur.fetchall():
+        emp_id, anniversary = row
+        if anniversary and '-' in anniversary:
+            new_anniversary = anniversary.replace('-', '/')
+            cur.execute("UPDATE employees SET anniversary = ? WHERE id = ?", (new_anniversary, emp_id))
+    connection.commit()
+    print("Migrated existing dates to YYYY/MM/DD format.")
+
+    # Vacation ledger: append-only grants/usages, with employees.days_taken/days_available
+    # kept as a materialized aggregate by the triggers below.
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='vacation_ledger'")
+    ledger_exists = cur.fetchone()
+
+    cur.execute('''CREATE TABLE IF NOT EXISTS vacation_ledger (
+                        id INTEGER PRIMARY KEY,
+                        employee_id INTEGER NOT NULL,
+                        entry_date DATE NOT NULL,
+                        kind TEXT NOT NULL CHECK (kind IN ('grant', 'usage')),
+                        days INTEGER NOT NULL,
+                        note TEXT)''')
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_vacation_ledger_employee_date "
+                "ON vacation_ledger (employee_id, entry_date, kind, days)")
+    cur.execute('''CREATE TABLE IF NOT EXISTS vacation_snapshots (
+                        employee_id INTEGER NOT NULL,
+                        snapshot_date DATE NOT NULL,
+                        days_granted INTEGER NOT NULL,
+                        days_taken INTEGER NOT NULL,
+                        PRIMARY KEY (employee_id, snapshot_date))''')
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_vacation_snapshots_date ON vacation_snapshots (snapshot_date)")
+
+    if not ledger_exists:
+        # Seed the ledger with each employee's current balance so history starts from today
+        opening_date = datetime.date.today().strftime("%Y/%m/%d")
+        cur.execute('''INSERT INTO vacation_ledger (employee_id, entry_date, kind, days, note)
+                       SELECT id, ?, 'grant', COALESCE(days_taken, 0) + COALESCE(days_available, 0), 'Opening balance'
+                       FROM employees''', (opening_date,))
+        cur.execute('''INSERT INTO vacation_ledger (employee_id, entry_date, kind, days, note)
+                       SELECT id, ?, 'usage', days_taken, 'Opening balance'
+                       FROM employees WHERE COALESCE(days_taken, 0) != 0''', (opening_date,))
+        print("Seeded vacation ledger with opening balances.")
+
+    cur.execute('''CREATE TRIGGER IF NOT EXISTS vacation_ledger_apply AFTER INSERT ON vacation_ledger
+                      BEGIN
+                          UPDATE employees SET
+                              days_taken = COALESCE(days_taken, 0) + CASE WHEN NEW.kind = 'usage' THEN NEW.days ELSE 0 END,
+                              days_available = COALESCE(days_available, 0) + CASE WHEN NEW.kind = 'grant' THEN NEW.days ELSE -NEW.days END
+                          WHERE id = NEW.employee_id;
+                      END''')
+    cur.execute('''CREATE TRIGGER IF NOT EXISTS vacation_ledger_no_update BEFORE UPDATE ON vacation_ledger
+                      BEGIN
+                          SELECT RAISE(ABORT, 'vacation_ledger is append-only');
+                      END''')
+    # History may only be removed once its employee has moved to the archive
+    cur.execute("DROP TRIGGER IF EXISTS vacation_ledger_no_delete")
+    cur.execute('''CREATE TRIGGER IF NOT EXISTS vacation_ledger_no_delete_active BEFORE DELETE ON vacation_ledger
+                      WHEN EXISTS (SELECT 1 FROM employees WHERE id = OLD.employee_id)
+                      BEGIN
+                          SELECT RAISE(ABORT, 'vacation_ledger is append-only');
+                      END''')
+    connection.commit()
+
+    attach_archive(connection, archive_path)
+
+    cur.execute("SELECT MAX(snapshot_date) FROM vacation_snapshots")
+    last_snapshot = cur.fetchone()[0]
+    if not last_snapshot or (datetime.datetime.now() - datetime.datetime.strptime(last_snapshot, "%Y/%m/%d")).days > SNAPSHOT_INTERVAL_DAYS:
+        take_vacation_snapshots(cur)
+        connection.commit()
+
+init_database(conn)
+
 class SplashScreen:
     def __init__(self, root):
         self.root = root
@@ -79,7 +432,11 @@ class SplashScreen:
         self.root.geometry(f"840x540+{x}+{y}")
 
         try:
-            img = Image.open("brand2.png")
+            splash_path = os.path.join(os.path.dirname(__file__), "brand2.png")
+            if not os.path.exists(splash_path):
+                # Builds that don't bundle the image still find it next to the executable, as they always have
+                splash_path = "brand2.png"
+            img = Image.open(splash_path)
             img = img.resize((840, 540), Image.Resampling.LANCZOS)
             self.photo = ImageTk.PhotoImage(img)
             self.label = tk.Label(self.root, image=self.photo)
@@ -89,7 +446,11 @@ class SplashScreen:
                                   font=("Arial", 20), bg="black", fg="white")
             self.label.pack(expand=True)
 
-        self.root.after(5000, self.close_splash)
+        # Map and paint the splash before timing it: with SPLASH_DURATION_MS at 0 (startup probe) the close timer
+        # would otherwise run before the idle callbacks that draw it
+        self.root.update()
+        mark_startup("splash")
+        self.root.after(SPLASH_DURATION_MS, self.close_splash)
 
     def close_splash(self):
         self.root.destroy()
@@ -161,6 +522,7 @@ class VacationApp:
         self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
         self.tree.bind("<Double-1>", self.on_double_click)
         self.tree.bind("<Button-3>", lambda e: self.tree.selection_set(self.tree.identify_row(e.y)))
+        self.tree.tag_configure("archived", foreground="gray")
 
         input_fields_frame = tk.Frame(root, background="gainsboro")
         input_fields_frame.pack(pady=5, anchor="n", fill="x")
@@ -235,24 +597,63 @@ class VacationApp:
                                            style="primary.Toolbutton")
         self.refresh_days_btn.grid(row=5, column=7, padx=5, pady=28)
 
+        self.archive_btn = Button(input_fields_frame, text="Archive", command=self.archive_selected,
+                                  style="danger.Outline.Toolbutton", state="disabled")
+        self.archive_btn.grid(row=2, column=5, padx=5, pady=6)
+
+        self.include_archived_var = tk.BooleanVar(value=False)
+        self.include_archived_check = ttk.Checkbutton(input_fields_frame, text="Include archived",
+                                                      variable=self.include_archived_var, command=self.load_data)
+        self.include_archived_check.grid(row=3, column=5, padx=5, pady=6)
+
         self.labels[4].grid(row=2, column=3, columnspan=1, pady=5, padx=10, sticky="e")
         self.days_slider = ttk.Scale(input_fields_frame, from_=0, to=0, orient="horizontal",
                                      command=self.on_slider_change, state="disabled")
         self.days_slider.grid(row=3, column=3, columnspan=2, padx=(0, 5), pady=5)
+        # Moving the slider only previews the change; releasing the mouse button or key that moved it records it as
+        # one usage entry dated by this field (ttk.Scale jumps/drags with buttons 1-3 and steps with the arrow keys)
+        for sequence in ("<ButtonRelease-1>", "<ButtonRelease-2>", "<ButtonRelease-3>", "<KeyRelease>"):
+            self.days_slider.bind(sequence, self.on_slider_release)
+        self.usage_date_entry = tk.Entry(input_fields_frame, bg="whitesmoke", borderwidth=0,
+                                         highlightthickness=0, width=10, fg="black", justify="center",
+                                         validate="key", validatecommand=vcmd_date, insertbackground="black")
+        self.usage_date_entry.insert(0, ledger_date())
+        self.usage_date_entry.grid(row=2, column=4, padx=(0, 5), pady=5, sticky="w")
 
         self.version_label = tk.Label(root, text="Version 1.2", font=("Arial", 12), fg="black")
         self.version_label.place(relx=0.48, rely=0.96, anchor="s")
 
+        menubar = tk.Menu(self.root)
+        backup_menu = tk.Menu(menubar, tearoff=0)
+        backup_menu.add_command(label="Back Up Now", command=self.start_backup)
+        backup_menu.add_command(label="Restore...", command=self.restore_backup)
+        menubar.add_cascade(label="Backup", menu=backup_menu)
+        self.root.config(menu=menubar)
+
         self.selected_employee_id = None
         self.preview_window = None
         self.doc_selector = None
         self.preview_label = None
         self.zoom_level = 1.0
+        self.backup_job = None
+        self.root.after(backup.BACKUP_INTERVAL_MINUTES * 60 * 1000, self.scheduled_backup)
+
+        if diagnostics.enabled:
+            diagnostics.enable(conn, self.root)
+        # Hidden diagnostics window for support sessions
+        self.root.bind("<Control-Shift-D>", lambda _: diagnostics.show_window(self.root, conn))
+
         self.load_data()
 
         self.update_employee_number_state("Company")
         self.root.update()
         self.root.geometry(f"{self.root.winfo_width()}x{self.root.winfo_height()}")
+        self.root.after_idle(self.on_startup_complete)
+
+    def on_startup_complete(self):
+        mark_startup("interactive")
+        if STARTUP_PROBE:
+            self.root.destroy()
 
     def show_centered_messagebox(self, title, message, msg_type="show_error"):
         """Show a centered Messagebox relative to the main application window."""
@@ -372,14 +773,19 @@ class VacationApp:
             days_taken = 0
             days_available = total_days - days_taken
 
-            cursor.execute("SELECT MAX(id) FROM employees")
+            # Archived ids stay reserved so they can be restored without clashing, and an id that still has ledger
+            # history (left behind by deletes before they cleared it) is never handed to a new hire
+            cursor.execute("SELECT MAX(id) FROM (SELECT id FROM employees UNION ALL SELECT id FROM archive.employees "
+                           "UNION ALL SELECT employee_id FROM vacation_ledger "
+                           "UNION ALL SELECT employee_id FROM archive.vacation_ledger)")
             max_id = cursor.fetchone()[0]
             employee_id = 1 if max_id is None else max_id + 1
 
             cursor.execute(
                 "INSERT INTO employees (id, name, employee_number, status, anniversary, days_taken, days_available, document_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (employee_id, name, employee_number, status, anniversary_str, days_taken, days_available, None)
+                (employee_id, name, employee_number, status, anniversary_str, 0, 0, None)
             )
+            record_vacation_entry(cursor, employee_id, "grant", total_days, note="Initial accrual")
             conn.commit()
 
             employee_number_display = "" if status == "Temp" else employee_number
@@ -417,9 +823,20 @@ class VacationApp:
         current_values = self.tree.item(self.selected_employee_id, "values")
         self.tree.item(self.selected_employee_id, values=(*current_values[:-1], doc_name))
 
+    @diagnostics.timed("on_tree_select")
     def on_tree_select(self, _):
         selected_item = self.tree.selection()
         if selected_item:
+            all_archived = all(self.tree.tag_has("archived", item) for item in selected_item)
+            self.archive_btn.config(state="normal", text="Restore" if all_archived else "Archive")
+        if selected_item and self.tree.tag_has("archived", selected_item[0]):
+            # Archived rows are read-only until restored
+            self.selected_employee_id = None
+            self.days_slider.config(state="disabled", from_=0, to=0)
+            self.delete_employee_btn.config(state="disabled")
+            self.preview_btn.config(state="disabled")
+            self.close_preview()
+        elif selected_item:
             self.selected_employee_id = int(selected_item[0])
             self.days_slider.config(state="normal")
             self.delete_employee_btn.config(state="normal")
@@ -437,6 +854,7 @@ class VacationApp:
             self.selected_employee_id = None
             self.days_slider.config(state="disabled", from_=0, to=0)
             self.delete_employee_btn.config(state="disabled")
+            self.archive_btn.config(state="disabled", text="Archive")
             self.preview_btn.config(state="disabled")
             self.close_preview()
             self.status_var.set("Company")
@@ -619,6 +1037,7 @@ class VacationApp:
         self.zoom_level = max(self.zoom_level - 0.2, 0.2)
         self.update_preview(None)
 
+    @diagnostics.timed("update_preview")
     def update_preview(self, _):
         if not self.preview_window or not self.selected_employee_id:
             return
@@ -630,22 +1049,11 @@ class VacationApp:
         doc_name, file_path = doc_list[selected_idx].split("|", 1)
 
         try:
-            if file_path.lower().endswith(('.jpg', '.jpeg')):
-                img = Image.open(file_path)
-            elif file_path.lower().endswith('.pdf'):
-                images = convert_from_path(file_path, first_page=1, last_page=1)
-                if images:
-                    img = images[0]
-                else:
-                    self.preview_label.config(image=None, text="PDF is empty")
-                    return
-            else:
-                self.preview_label.config(image=None, text="Unsupported file format")
+            img, message = load_preview_image(file_path, self.zoom_level)
+            if img is None:
+                self.preview_label.config(image=None, text=message)
                 return
 
-            base_size = 600
-            new_size = int(base_size * self.zoom_level)
-            img.thumbnail((new_size, new_size))
             photo = ImageTk.PhotoImage(img)
             self.preview_label.config(image=photo, text="")
             self.preview_window.image = photo
@@ -659,6 +1067,7 @@ class VacationApp:
             self.doc_selector = None
             self.preview_label = None
 
+    @diagnostics.timed("on_slider_change")
     def on_slider_change(self, value):
         if not self.selected_employee_id:
             return
@@ -666,22 +1075,51 @@ class VacationApp:
         try:
             new_days_taken = int(float(value))
             cursor.execute("SELECT anniversary FROM employees WHERE id = ?", (self.selected_employee_id,))
-            anniversary_str = cursor.fetchone()[0]
+            anniversary = datetime.datetime.strptime(cursor.fetchone()[0], "%Y/%m/%d")
+            total_days = calculate_vacation_days(anniversary)
+            self.show_days_taken(min(new_days_taken, total_days), total_days)
+        except sqlite3.Error as e:
+            self.show_centered_messagebox(title="Database Error", message=f"Error adjusting days: {e}", msg_type="show_error")
+
+    @diagnostics.timed("on_slider_release")
+    def on_slider_release(self, _):
+        if not self.selected_employee_id:
+            return
+
+        try:
+            new_days_taken = int(float(self.days_slider.get()))
+            cursor.execute("SELECT anniversary, days_taken, days_available FROM employees WHERE id = ?",
+                           (self.selected_employee_id,))
+            anniversary_str, days_taken, days_available = cursor.fetchone()
             anniversary = datetime.datetime.strptime(anniversary_str, "%Y/%m/%d")
             total_days = calculate_vacation_days(anniversary)
-            if new_days_taken > total_days:
-                new_days_taken = total_days
-            new_days_available = total_days - new_days_taken
-            cursor.execute("UPDATE employees SET days_taken = ?, days_available = ? WHERE id = ?",
-                           (new_days_taken, new_days_available, self.selected_employee_id))
+            new_days_taken = min(new_days_taken, total_days)
+            if new_days_taken == days_taken:
+                return
+            try:
+                usage_date = datetime.datetime.strptime(self.usage_date_entry.get(), "%Y/%m/%d")
+            except ValueError:
+                self.days_slider.set(days_taken)
+                self.show_days_taken(days_taken, total_days)
+                self.show_centered_messagebox(title="Error", message="Usage date must be in YYYY/MM/DD format!",
+                                              msg_type="show_error")
+                return
+            accrue_vacation_days(cursor, self.selected_employee_id, total_days, days_taken, days_available)
+            # Moving the slider back records a negative usage (a correction), never an edit
+            record_vacation_entry(cursor, self.selected_employee_id, "usage", new_days_taken - days_taken,
+                                  entry_date=usage_date, note="Slider adjustment")
             conn.commit()
-            current_values = self.tree.item(self.selected_employee_id, "values")
-            self.tree.item(self.selected_employee_id, values=(
-                current_values[0], current_values[1], current_values[2], current_values[3],
-                new_days_taken, new_days_available, current_values[6]))
+            self.show_days_taken(new_days_taken, total_days)
         except sqlite3.Error as e:
+            conn.rollback()
             self.show_centered_messagebox(title="Database Error", message=f"Error adjusting days: {e}", msg_type="show_error")
 
+    def show_days_taken(self, days_taken, total_days):
+        current_values = self.tree.item(self.selected_employee_id, "values")
+        self.tree.item(self.selected_employee_id, values=(
+            current_values[0], current_values[1], current_values[2], current_values[3],
+            days_taken, total_days - days_taken, current_values[6]))
+
     def delete_employee(self):
         if not self.selected_employee_id:
             self.show_centered_messagebox(title="Error", message="Please select an employee to delete!", msg_type="show_error")
@@ -689,7 +1127,7 @@ class VacationApp:
 
         if self.show_centered_messagebox(title="Confirm Delete", message="Are you sure you want to delete this employee?", msg_type="yesno") == "Yes":
             try:
-                cursor.execute("DELETE FROM employees WHERE id = ?", (self.selected_employee_id,))
+                delete_employees(cursor, [self.selected_employee_id])
                 conn.commit()
                 self.tree.delete(self.selected_employee_id)
                 self.selected_employee_id = None
@@ -701,40 +1139,59 @@ class VacationApp:
                 self.update_treeview_style("Company")
                 self.show_centered_messagebox(title="Success", message="Employee deleted successfully!", msg_type="show_info")
             except sqlite3.Error as e:
+                conn.rollback()
                 self.show_centered_messagebox(title="Database Error", message=f"Error deleting employee: {e}", msg_type="show_error")
 
+    def archive_selected(self):
+        selected_items = self.tree.selection()
+        if not selected_items:
+            return
+        archived_ids = [int(item) for item in selected_items if self.tree.tag_has("archived", item)]
+        active_ids = [int(item) for item in selected_items if not self.tree.tag_has("archived", item)]
+
+        try:
+            if active_ids:
+                if self.show_centered_messagebox(title="Confirm Archive",
+                                                 message=f"Move {len(active_ids)} employee(s) to the archive?",
+                                                 msg_type="yesno") != "Yes":
+                    return
+                archive_employees(cursor, active_ids)
+                message = "Employee(s) archived successfully!"
+            else:
+                for employee_id in archived_ids:
+                    cursor.execute("SELECT a.id FROM archive.employees a JOIN employees e "
+                                   "ON e.employee_number = a.employee_number AND e.status = 'Company' AND a.status = 'Company' "
+                                   "WHERE a.id = ?", (employee_id,))
+                    if cursor.fetchone():
+                        self.show_centered_messagebox(title="Error", message="Employee Number already exists!",
+                                                      msg_type="show_error")
+                        return
+                restore_employees(cursor, archived_ids)
+                message = "Employee(s) restored successfully!"
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            self.show_centered_messagebox(title="Database Error", message=f"Error archiving employees: {e}", msg_type="show_error")
+            return
+
+        self.tree.selection_remove(*selected_items)
+        self.load_data()
+        self.show_centered_messagebox(title="Success", message=message, msg_type="show_info")
+
+    @diagnostics.timed("load_data")
     def load_data(self, sort_by_last_name=False):
         try:
             self.tree.delete(*self.tree.get_children())
-            query = "SELECT id, employee_number, name, status, anniversary, days_taken, days_available, document_path FROM employees"
-            if sort_by_last_name:
-                rows = cursor.execute(query).fetchall()
-                rows.sort(key=lambda x: x[2].split()[-1] if x[2].split() else x[2])
-            else:
-                rows = cursor.execute(query + " ORDER BY id").fetchall()
-
-            for row in rows:
-                employee_id, employee_number, name, status, anniversary, days_taken, days_available, doc_path = row
-                anniversary_date = datetime.datetime.strptime(anniversary, "%Y/%m/%d")
-                total_days = calculate_vacation_days(anniversary_date)
-                updated_available = total_days - days_taken
-                if updated_available != days_available:
-                    cursor.execute("UPDATE employees SET days_available = ? WHERE id = ?", (updated_available, employee_id))
-                    conn.commit()
-                doc_name = ""
-                if doc_path and ";" in doc_path:
-                    doc_name = doc_path.split(";")[-1].split("|")[0]
-                elif doc_path:
-                    doc_name = doc_path.split("|")[0]
-                employee_number_str = "" if employee_number is None else str(employee_number)
-                self.tree.insert("", "end", iid=employee_id,
-                                values=(name, employee_number_str, status, anniversary, days_taken, updated_available, doc_name))
+            for employee_id, values, archived in fetch_employee_rows(cursor, sort_by_last_name,
+                                                                     self.include_archived_var.get()):
+                self.tree.insert("", "end", iid=employee_id, values=values, tags=("archived",) if archived else ())
         except sqlite3.Error as e:
             self.show_centered_messagebox(title="Database Error", message=f"Error loading data: {e}", msg_type="show_error")
 
     def refresh_days(self):
         self.load_data(sort_by_last_name=True)
 
+    @diagnostics.timed("print_database")
     def print_database(self):
         try:
             # Get selected employees from Treeview
@@ -744,33 +1201,7 @@ class VacationApp:
                                               msg_type="show_error")
                 return
 
-            # Prepare the report header
-            output = "Selected Employees Report\n"
-            output += "=" * 120 + "\n"
-            header = f"{'Name':<20} {'#':^10} {'Status':^15} {'Anniversary':^20} {'Days Taken':^15} {'Days Available':^15} {'Document':^25}"
-            output += header + "\n"
-            output += "=" * 120 + "\n"
-
-            # Fetch data for each selected employee
-            for employee_id in selected_items:
-                cursor.execute(
-                    "SELECT employee_number, name, status, anniversary, days_taken, days_available, document_path FROM employees WHERE id = ?",
-                    (employee_id,)
-                )
-                row = cursor.fetchone()
-                if row:
-                    employee_number, name, status, anniversary, days_taken, days_available, doc_path = row
-                    employee_number_str = "" if employee_number is None else str(employee_number)
-                    doc_name = ""
-                    if doc_path and ";" in doc_path:
-                        doc_name = doc_path.split(";")[-1].split("|")[0]
-                    elif doc_path:
-                        doc_name = doc_path.split("|")[0]
-
-                    line = f"{name:<20} {employee_number_str:^10} {status:^15} {anniversary:^20} {days_taken:^15} {days_available:^15} {doc_name:^25}"
-                    output += line + "\n"
-
-            output += "=" * 120 + "\n"
+            output = build_report(cursor, selected_items, self.include_archived_var.get())
 
             # Display the report in a new window
             print_window = tk.Toplevel(self.root)
@@ -800,6 +1231,101 @@ class VacationApp:
             self.show_centered_messagebox(title="Database Error", message=f"Error generating report: {e}",
                                           msg_type="show_error")
 
+    def start_backup(self, notify=True, force=True, on_done=None):
+        """Start a background backup; on_done(error) runs on the Tk thread when it finishes (error is None on success)."""
+        if self.backup_job and self.backup_job.is_alive():
+            return
+        # The copy runs on its own connection in a background thread; poll for completion from the Tk loop
+        self.backup_job = backup.BackupJob([db_file, archive_file], force=force)
+        self.backup_job.start()
+        self.root.after(200, self.check_backup, notify, on_done)
+
+    def check_backup(self, notify, on_done=None):
+        if self.backup_job.is_alive():
+            self.root.after(200, self.check_backup, notify, on_done)
+            return
+        if self.backup_job.error:
+            message = f"Error backing up database: {self.backup_job.error}"
+            if on_done:
+                message += "\nThe restore was cancelled."
+            self.show_centered_messagebox(title="Backup Error", message=message, msg_type="show_error")
+        elif notify:
+            self.show_centered_messagebox(title="Success", message=f"Backup saved to {backup.BACKUP_DIR}",
+                                          msg_type="show_info")
+        if on_done:
+            on_done(self.backup_job.error)
+
+    def scheduled_backup(self):
+        self.start_backup(notify=False, force=False)
+        self.root.after(backup.BACKUP_INTERVAL_MINUTES * 60 * 1000, self.scheduled_backup)
+
+    def restore_backup(self):
+        file_path = filedialog.askopenfilename(initialdir=backup.BACKUP_DIR,
+                                               filetypes=[("Database Backups", "*.db.gz")])
+        if not file_path:
+            return
+
+        if self.show_centered_messagebox(title="Confirm Restore",
+                                         message="Replace all current data with this backup?", msg_type="yesno") != "Yes":
+            return
+
+        if self.backup_job and self.backup_job.is_alive():
+            self.show_centered_messagebox(title="Restore", message="A backup is in progress. Try again when it finishes.",
+                                          msg_type="show_info")
+            return
+        # employees.db and employees_archive.db are snapshotted together; restore the whole set the file belongs to
+        snapshot_set = backup.backup_set_for(file_path, [db_file, archive_file])
+        if not snapshot_set or not snapshot_set[db_file]:
+            self.show_centered_messagebox(title="Restore Error",
+                                          message="No employees.db snapshot was taken with this backup.",
+                                          msg_type="show_error")
+            return
+        try:
+            conflicts = find_restore_conflicts(snapshot_set[db_file], snapshot_set[archive_file])
+            if conflicts:
+                self.show_centered_messagebox(
+                    title="Restore Error",
+                    message="This backup would leave these employees both current and archived: "
+                            + ", ".join(str(employee_id) for employee_id in conflicts[:10]),
+                    msg_type="show_error")
+                return
+            # Hold on to the chosen set: rotation after the pre-restore backup below may delete it from the backup dir
+            restore_dir = tempfile.mkdtemp(prefix="vac_app_restore_")
+            snapshot_set = {db_path: shutil.copy(path, restore_dir) if path else None
+                            for db_path, path in snapshot_set.items()}
+        except (sqlite3.Error, OSError) as e:
+            self.show_centered_messagebox(title="Database Error", message=f"Error restoring backup: {e}", msg_type="show_error")
+            return
+
+        # Snapshot the current state first so the restore itself can be undone (the newest set already holds it
+        # if nothing has changed since). The copy runs in the background; the restore continues once it is done.
+        self.start_backup(notify=False, force=False,
+                          on_done=lambda error: self.finish_restore(snapshot_set, restore_dir, error))
+
+    def finish_restore(self, snapshot_set, restore_dir, backup_error):
+        try:
+            if backup_error:
+                return
+            backup.restore_database(conn, snapshot_set[db_file])
+            if snapshot_set[archive_file]:
+                # The backup API only writes to a connection's main database, so restore through a direct one
+                archive_conn = sqlite3.connect(archive_file)
+                try:
+                    backup.restore_database(archive_conn, snapshot_set[archive_file])
+                finally:
+                    archive_conn.close()
+            self.selected_employee_id = None
+            self.days_slider.config(state="disabled", from_=0, to=0)
+            self.delete_employee_btn.config(state="disabled")
+            self.preview_btn.config(state="disabled")
+            self.close_preview()
+            self.load_data()
+            self.show_centered_messagebox(title="Success", message="Backup restored successfully!", msg_type="show_info")
+        except (sqlite3.Error, OSError) as e:
+            self.show_centered_messagebox(title="Database Error", message=f"Error restoring backup: {e}", msg_type="show_error")
+        finally:
+            shutil.rmtree(restore_dir, ignore_errors=True)
+
     def clear_entries(self):
         self.employee_number_entry.config(state="normal")
         self.employee_number_entry.delete(0, tk.END)
@@ -814,5 +1340,4 @@ if __name__ == "__main__":
     splash_root = tk.Tk()
     splash = SplashScreen(splash_root)
     splash_root.mainloop()
-
-conn.close()
\ No newline at end of file
+    conn.close()
\ No newline at end of file
@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('brand2.png', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,80 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Startup-optimized build: pyinstaller main_onedir.spec
+#
+# Unlike main.spec (onefile + UPX), this produces dist/main/ with everything already on disk, so launching
+# does not unpack the bundle into a temp dir or decompress UPX sections before the splash can show.
+# Bytecode is built with -OO, and the Pillow plugins and ttkbootstrap modules the app never uses are left out.
+# Compare the two builds with: python -m benchmarks.startup --frozen dist/main.exe dist/main/main.exe
+
+# Pillow image formats the app does not open (it only needs PNG for the splash, JPEG for documents,
+# PPM for pdf2image output, and the BMP/GIF/TIFF/MPO helpers those pull in)
+UNUSED_PIL_MODULES = [
+    'PIL.AvifImagePlugin', 'PIL.BlpImagePlugin', 'PIL.BufrStubImagePlugin', 'PIL.CurImagePlugin',
+    'PIL.DcxImagePlugin', 'PIL.DdsImagePlugin', 'PIL.EpsImagePlugin', 'PIL.FitsImagePlugin',
+    'PIL.FliImagePlugin', 'PIL.FpxImagePlugin', 'PIL.FtexImagePlugin', 'PIL.GbrImagePlugin',
+    'PIL.GribStubImagePlugin', 'PIL.Hdf5StubImagePlugin', 'PIL.IcnsImagePlugin', 'PIL.IcoImagePlugin',
+    'PIL.ImImagePlugin', 'PIL.ImtImagePlugin', 'PIL.IptcImagePlugin', 'PIL.Jpeg2KImagePlugin',
+    'PIL.McIdasImagePlugin', 'PIL.MicImagePlugin', 'PIL.MpegImagePlugin', 'PIL.MspImagePlugin',
+    'PIL.PalmImagePlugin', 'PIL.PcdImagePlugin', 'PIL.PcxImagePlugin', 'PIL.PdfImagePlugin',
+    'PIL.PixarImagePlugin', 'PIL.PsdImagePlugin', 'PIL.QoiImagePlugin', 'PIL.SgiImagePlugin',
+    'PIL.SpiderImagePlugin', 'PIL.SunImagePlugin', 'PIL.TgaImagePlugin', 'PIL.WebPImagePlugin',
+    'PIL.WmfImagePlugin', 'PIL.XVThumbImagePlugin', 'PIL.XbmImagePlugin', 'PIL.XpmImagePlugin',
+    'PIL.ImageQt', 'PIL.ImageGrab', 'PIL.ImageShow', 'PIL.ImageWin', 'PIL.PSDraw', 'PIL._avif', 'PIL._webp',
+]
+
+# ttkbootstrap widgets/dialogs the app never creates (the color chooser is only reachable through a lazy import)
+UNUSED_TTKBOOTSTRAP_MODULES = [
+    'ttkbootstrap.__main__', 'ttkbootstrap.dialogs.colorchooser', 'ttkbootstrap.dialogs.colordropper',
+    'ttkbootstrap.scrolled', 'ttkbootstrap.tableview', 'ttkbootstrap.toast', 'ttkbootstrap.tooltip',
+    'ttkbootstrap.validation',
+]
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('brand2.png', '.')],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=UNUSED_PIL_MODULES + UNUSED_TTKBOOTSTRAP_MODULES + [
+        'customtkinter', 'darkdetect', 'numpy', 'unittest', 'pydoc', 'api', 'benchmarks',
+    ],
+    noarchive=False,
+    optimize=2,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='main',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='main',
+)
+app = BUNDLE(
+    coll,
+    name='main.app',
+    icon=None,
+    bundle_identifier=None,
+)
@@ -0,0 +1,168 @@
+"""End-to-end checks of the local JSON API against a scratch database.
+
+Run with: python -m pytest tests
+"""
+import http.client
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRATCH_DIR = tempfile.mkdtemp(prefix="vac_app_api_test_")
+# main opens VAC_APP_DB at import time, so point it at scratch space before anything imports it
+os.environ["VAC_APP_DB"] = os.path.join(SCRATCH_DIR, "import.db")
+sys.path.insert(0, REPO_DIR)
+
+import api  # noqa: E402
+
+EMPLOYEES = [
+    (1, 101, "Ana Lopez", "Company", "2020/01/15"),
+    (2, 102, "Ben Ortiz", "Company", "2024/06/01"),
+    (3, None, "Cam Reyes", "Agency", "2019/03/10"),
+]
+
+
+def create_database(path):
+    connection = sqlite3.connect(path)
+    connection.execute('''CREATE TABLE employees (
+                              id INTEGER PRIMARY KEY,
+                              employee_number INTEGER,
+                              name TEXT,
+                              status TEXT,
+                              anniversary DATE,
+                              days_taken INTEGER,
+                              days_available INTEGER,
+                              document_path TEXT)''')
+    connection.executemany("INSERT INTO employees (id, employee_number, name, status, anniversary, days_taken, "
+                           "days_available) VALUES (?, ?, ?, ?, ?, 0, 0)", EMPLOYEES)
+    connection.commit()
+    connection.close()
+
+
+def tearDownModule():
+    shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+
+class ApiServerTest(unittest.TestCase):
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(dir=SCRATCH_DIR), "employees.db")
+        create_database(self.db_path)
+        self.server, self.store = api.make_server(port=0, readers=2, db_path=self.db_path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.addCleanup(self.stop_server)
+
+    def stop_server(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.store.close()
+        self.thread.join()
+
+    def request(self, method, path, body=None, headers=None):
+        client = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+        try:
+            if isinstance(body, dict):
+                body = json.dumps(body)
+            client.request(method, path, body=body, headers=headers or {})
+            response = client.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            client.close()
+
+    def test_list_employees(self):
+        status, employees = self.request("GET", "/employees")
+        self.assertEqual(status, 200)
+        self.assertEqual([employee["name"] for employee in employees], ["Ana Lopez", "Ben Ortiz", "Cam Reyes"])
+
+        status, employees = self.request("GET", "/employees?status=Agency")
+        self.assertEqual([employee["id"] for employee in employees], [3])
+
+    def test_balance_follows_usage(self):
+        status, before = self.request("GET", "/employees/1/balance")
+        self.assertEqual(status, 200)
+        self.assertGreater(before["days_available"], 2)
+
+        status, result = self.request("POST", "/employees/1/usage", {"days": 2, "note": "Test"})
+        self.assertEqual(status, 200)
+        self.assertEqual(result["days_taken"], before["days_taken"] + 2)
+
+        status, after = self.request("GET", "/employees/1/balance")
+        self.assertEqual(after["days_taken"], before["days_taken"] + 2)
+        self.assertEqual(after["days_available"], before["days_available"] - 2)
+
+    def test_balance_matches_employee_after_accrual(self):
+        # Stand in for a server left running while days accrue: the entitlement grows with no request writing
+        # a new grant to the ledger
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("UPDATE employees SET anniversary = '2010/01/15' WHERE id = 1")
+        connection.commit()
+        connection.close()
+
+        status, employee = self.request("GET", "/employees/1")
+        status, balance = self.request("GET", "/employees/1/balance")
+        self.assertEqual(balance["days_available"], employee["days_available"])
+        self.assertEqual(balance["days_taken"], employee["days_taken"])
+
+    def test_usage_between_dates(self):
+        self.request("POST", "/employees/1/usage", {"days": 2, "date": "2025/03/10"})
+        self.request("POST", "/employees/1/usage", {"days": 1, "date": "2025/07/01"})
+
+        status, usage = self.request("GET", "/employees/1/usage?from=2025/03/10&to=2025/06/30")
+        self.assertEqual(status, 200)
+        self.assertEqual(usage["days_taken"], 2)
+        status, usage = self.request("GET", "/employees/1/usage?from=2025/01/01&to=2025/12/31")
+        self.assertEqual(usage["days_taken"], 3)
+
+        status, error = self.request("GET", "/employees/1/usage?from=2025/12/31&to=2025/01/01")
+        self.assertEqual(status, 400)
+
+    def test_over_use_is_a_conflict(self):
+        status, before = self.request("GET", "/employees/2/balance")
+        status, error = self.request("POST", "/employees/2/usage", {"days": before["days_available"] + 1})
+        self.assertEqual(status, 409)
+        self.assertIn("error", error)
+
+        status, after = self.request("GET", "/employees/2/balance")
+        self.assertEqual(after, before)
+
+    def test_malformed_body(self):
+        status, error = self.request("POST", "/employees/1/usage", "{not json",
+                                     {"Content-Type": "application/json"})
+        self.assertEqual(status, 400)
+
+        status, error = self.request("POST", "/employees/1/usage", {"days": "two"})
+        self.assertEqual(status, 400)
+
+    def test_malformed_content_length(self):
+        client = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+        try:
+            client.putrequest("POST", "/employees/1/usage")
+            client.putheader("Content-Length", "abc")
+            client.endheaders()
+            response = client.getresponse()
+            self.assertEqual(response.status, 400)
+            self.assertIn("Content-Length", json.loads(response.read())["error"])
+        finally:
+            client.close()
+
+    def test_unknown_employee(self):
+        status, error = self.request("GET", "/employees/99")
+        self.assertEqual(status, 404)
+
+        status, error = self.request("GET", "/employees/99999999999999999999")
+        self.assertEqual(status, 404)
+        status, error = self.request("GET", "/employees/99999999999999999999/balance")
+        self.assertEqual(status, 404)
+
+    def test_note_must_be_text(self):
+        status, error = self.request("POST", "/employees/1/usage", {"days": 1, "note": 5})
+        self.assertEqual(status, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()